@@ -13,157 +13,245 @@ Usage:
 """
 
 import argparse
+import atexit
+import base64
+import functools
+import hashlib
 import os
 import secrets
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
+from urllib.parse import urlsplit
+
+from dotenv import dotenv_values
+
+# Environment variables forwarded to the server process
+_ENV_KEYS = (
+    "NEO4J_URI",
+    "NEO4J_USERNAME",
+    "NEO4J_PASSWORD",
+    "NEO4J_DATABASE",
+    "NEO4J_TRANSPORT",
+    "NEO4J_MCP_SERVER_HOST",
+    "NEO4J_MCP_SERVER_PORT",
+    "NEO4J_MCP_SERVER_PATH",
+    "NEO4J_API_KEY",
+)
+
+# Host variables the server process actually needs; everything else in the
+# parent environment stays behind
+_PASSTHROUGH_VARS = frozenset(
+    {
+        "PATH",
+        "HOME",
+        "USER",
+        "LOGNAME",
+        "LANG",
+        "LC_ALL",
+        "LC_CTYPE",
+        "TERM",
+        "TMPDIR",
+        "SHELL",
+        "VIRTUAL_ENV",
+        "PYTHONPATH",
+        "UV_CACHE_DIR",
+        "UV_PROJECT_ENVIRONMENT",
+    }
+)
+
+
+# Template for the generated .env file, formatted once per update
+_ENV_TEMPLATE = """# Neo4j Connection (from your cloud instance)
+NEO4J_URI={NEO4J_URI}
+NEO4J_USERNAME={NEO4J_USERNAME}
+NEO4J_PASSWORD={NEO4J_PASSWORD}
+NEO4J_DATABASE={NEO4J_DATABASE}
+
+# Server Configuration (for testing)
+NEO4J_TRANSPORT={NEO4J_TRANSPORT}
+NEO4J_MCP_SERVER_HOST={NEO4J_MCP_SERVER_HOST}
+NEO4J_MCP_SERVER_PORT={NEO4J_MCP_SERVER_PORT}
+NEO4J_MCP_SERVER_PATH={NEO4J_MCP_SERVER_PATH}
+
+# API Key (generated for this server session)
+NEO4J_API_KEY={NEO4J_API_KEY}
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def load_env(env_path: Path) -> dict:
+    """Parse the .env file once and cache the result for later callers."""
+    return dotenv_values(env_path)
+
+
+def docker_image_tag(project_dir: Path) -> str:
+    """Compute a Docker image tag from the build inputs.
 
-from dotenv import load_dotenv
+    Hashes the Dockerfile and everything it COPYs into the image
+    (pyproject.toml, README.md, src/) so the tag only changes when the
+    image content would change. __pycache__ is skipped since .pyc files
+    embed timestamps that would churn the tag without changing the image.
+    """
+    h = hashlib.blake2b()
+    files = [
+        project_dir / "Dockerfile",
+        project_dir / "pyproject.toml",
+        project_dir / "README.md",
+    ]
+    files.extend(
+        sorted(
+            p
+            for p in (project_dir / "src").rglob("*")
+            if "__pycache__" not in p.parts
+        )
+    )
+    for f in files:
+        if f.is_file():
+            h.update(str(f.relative_to(project_dir)).encode())
+            h.update(f.read_bytes())
+    return f"mcp-neo4j-cypher:dev-{h.hexdigest()[:12]}"
 
 
 def generate_api_key() -> str:
-    """Generate a secure random API key."""
-    return secrets.token_urlsafe(32)
+    """Generate a secure random API key.
 
+    192 bits of entropy encoded as 32 characters of base64url.
+    """
+    return base64.urlsafe_b64encode(secrets.token_bytes(24)).rstrip(b"=").decode("ascii")
 
-def update_env_with_api_key(api_key: str, env_path: Path) -> None:
-    """Update .env file with generated API key while preserving Neo4j connection info."""
+
+def update_env_with_api_key(api_key: str, env_path: Path) -> dict:
+    """Update .env file with generated API key while preserving Neo4j connection info.
+
+    Returns the full server configuration dict so callers don't need to
+    re-read the .env file.
+    """
     if not env_path.exists():
         print(f"✗ .env file not found at {env_path}")
         print(f"Please copy .env.sample to .env and add your Neo4j credentials")
         sys.exit(1)
 
-    # Load existing .env to preserve Neo4j connection info
-    load_dotenv(env_path)
+    # Parse existing .env to preserve Neo4j connection info
+    existing = load_env(env_path)
 
     # Get Neo4j connection info from existing .env
-    neo4j_uri = os.getenv("NEO4J_URI")
-    neo4j_username = os.getenv("NEO4J_USERNAME")
-    neo4j_password = os.getenv("NEO4J_PASSWORD")
-    neo4j_database = os.getenv("NEO4J_DATABASE", "neo4j")
+    neo4j_uri = existing.get("NEO4J_URI")
+    neo4j_username = existing.get("NEO4J_USERNAME")
+    neo4j_password = existing.get("NEO4J_PASSWORD")
+    neo4j_database = existing.get("NEO4J_DATABASE") or "neo4j"
 
     if not all([neo4j_uri, neo4j_username, neo4j_password]):
         print("✗ Missing Neo4j connection info in .env file")
         print("Please ensure NEO4J_URI, NEO4J_USERNAME, and NEO4J_PASSWORD are set")
         sys.exit(1)
 
-    # Create updated .env with all configuration
-    env_content = f"""# Neo4j Connection (from your cloud instance)
-NEO4J_URI={neo4j_uri}
-NEO4J_USERNAME={neo4j_username}
-NEO4J_PASSWORD={neo4j_password}
-NEO4J_DATABASE={neo4j_database}
+    env_config = {
+        "NEO4J_URI": neo4j_uri,
+        "NEO4J_USERNAME": neo4j_username,
+        "NEO4J_PASSWORD": neo4j_password,
+        "NEO4J_DATABASE": neo4j_database,
+        "NEO4J_TRANSPORT": "http",
+        "NEO4J_MCP_SERVER_HOST": "127.0.0.1",
+        "NEO4J_MCP_SERVER_PORT": "8001",
+        "NEO4J_MCP_SERVER_PATH": "/mcp/",
+        "NEO4J_API_KEY": api_key,
+    }
 
-# Server Configuration (for testing)
-NEO4J_TRANSPORT=http
-NEO4J_MCP_SERVER_HOST=127.0.0.1
-NEO4J_MCP_SERVER_PORT=8001
-NEO4J_MCP_SERVER_PATH=/mcp/
+    # Create updated .env with all configuration
+    env_content = _ENV_TEMPLATE.format_map(env_config)
 
-# API Key (generated for this server session)
-NEO4J_API_KEY={api_key}
-"""
-    env_path.write_text(env_content)
+    # Single open/write/close so the API key is written in one syscall;
+    # fchmod tightens pre-existing files too, since the mode on os.open
+    # only applies when the file is created
+    payload = env_content.encode("utf-8")
+    fd = os.open(env_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
     print(f"✓ Updated .env file with API key")
 
+    return env_config
 
-def start_server(api_key: str) -> None:
+
+def start_server(api_key: str, env_config: dict) -> None:
     """Start the MCP server using uv."""
     print("Starting MCP Neo4j Cypher server...")
 
-    # Load environment variables from .env file
     project_dir = Path(__file__).parent.parent
-    load_dotenv(Path(__file__).parent / ".env")
-
-    # Create environment dict with values from .env
-    env = os.environ.copy()
-    env_updates = {
-        "NEO4J_URI": os.getenv("NEO4J_URI"),
-        "NEO4J_USERNAME": os.getenv("NEO4J_USERNAME"),
-        "NEO4J_PASSWORD": os.getenv("NEO4J_PASSWORD"),
-        "NEO4J_DATABASE": os.getenv("NEO4J_DATABASE"),
-        "NEO4J_TRANSPORT": os.getenv("NEO4J_TRANSPORT"),
-        "NEO4J_MCP_SERVER_HOST": os.getenv("NEO4J_MCP_SERVER_HOST"),
-        "NEO4J_MCP_SERVER_PORT": os.getenv("NEO4J_MCP_SERVER_PORT"),
-        "NEO4J_MCP_SERVER_PATH": os.getenv("NEO4J_MCP_SERVER_PATH"),
-        "NEO4J_API_KEY": api_key,  # Use the generated API key directly
-    }
 
-    # Filter out None values and update env
+    # Copy only the passthrough subset of os.environ instead of the whole
+    # parent environment, then overlay the parsed configuration with plain
+    # dict lookups instead of repeated os.environ access
+    env = {k: v for k, v in os.environ.items() if k in _PASSTHROUGH_VARS}
+    env_updates = {k: env_config.get(k) for k in _ENV_KEYS}
     env.update({k: v for k, v in env_updates.items() if v is not None})
 
     print(f"Server URL: http://{env.get('NEO4J_MCP_SERVER_HOST')}:{env.get('NEO4J_MCP_SERVER_PORT')}{env.get('NEO4J_MCP_SERVER_PATH')}")
     print(f"API Key: {api_key}")
     print("\nPress Ctrl+C to stop the server\n")
 
-    # Start server process (foreground)
-    try:
-        subprocess.run(
-            ["uv", "run", "mcp-neo4j-cypher"],
-            cwd=project_dir,
-            env=env,
-        )
-    except KeyboardInterrupt:
-        print("\n\n✓ Server stopped")
-
+    # Replace this process with the server instead of forking a child;
+    # the server owns the terminal from here on
+    os.chdir(project_dir)
 
-def start_server_docker(api_key: str) -> None:
-    """Start the MCP server in a Docker container."""
-    print("Starting MCP Neo4j Cypher server in Docker...")
-    print()
+    # Exec the console script directly when the project venv is already
+    # synced, skipping uv's per-invocation resolution; fall back to uv run
+    venv_dir = Path(os.environ.get("UV_PROJECT_ENVIRONMENT", project_dir / ".venv"))
+    entry = venv_dir / "bin" / "mcp-neo4j-cypher"
+    if entry.exists():
+        os.execvpe(str(entry), [str(entry)], env)
+    os.execvpe("uv", ["uv", "run", "mcp-neo4j-cypher"], env)
 
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent / ".env"
-    load_dotenv(env_path)
-
-    # Get project directory (parent of test_api)
-    project_dir = Path(__file__).parent.parent
-
-    # Build Docker image
-    image_name = "mcp-neo4j-cypher:dev-latest"
-    print(f"Building Docker image: {image_name}")
-    print(f"Building from: {project_dir}")
-    print()
 
+def _run_docker_cli(image_name: str, project_dir: Path, env_map: dict, server_port: str) -> None:
+    """Build (if needed) and run the server image via the docker CLI."""
     try:
-        subprocess.run(
-            ["docker", "build", "-t", image_name, "."],
-            cwd=project_dir,
-            check=True,
+        image_exists = (
+            subprocess.run(
+                ["docker", "image", "inspect", image_name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ).returncode
+            == 0
         )
-        print(f"✓ Docker image built successfully")
-        print()
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Failed to build Docker image (exit code {e.returncode})")
-        sys.exit(1)
     except FileNotFoundError:
         print("✗ Docker not found")
         print("Please install Docker: https://docs.docker.com/get-docker/")
         sys.exit(1)
 
-    # Prepare environment variables for container
-    neo4j_uri = os.getenv("NEO4J_URI")
-    neo4j_username = os.getenv("NEO4J_USERNAME")
-    neo4j_password = os.getenv("NEO4J_PASSWORD")
-    neo4j_database = os.getenv("NEO4J_DATABASE", "neo4j")
-
-    # For Docker on Mac/Windows, need to use special hostname to access host
-    # Replace localhost/127.0.0.1 with host.docker.internal
-    if neo4j_uri and ("localhost" in neo4j_uri or "127.0.0.1" in neo4j_uri):
-        neo4j_uri = neo4j_uri.replace("localhost", "host.docker.internal")
-        neo4j_uri = neo4j_uri.replace("127.0.0.1", "host.docker.internal")
-        print(f"⚠️  Modified Neo4j URI for Docker: {neo4j_uri}")
+    if image_exists:
+        print(f"✓ Reusing cached Docker image: {image_name}")
+        print()
+    else:
+        print(f"Building Docker image: {image_name}")
+        print(f"Building from: {project_dir}")
         print()
 
-    server_host = "0.0.0.0"  # Bind to all interfaces in container
-    server_port = os.getenv("NEO4J_MCP_SERVER_PORT", "8001")
-    server_path = os.getenv("NEO4J_MCP_SERVER_PATH", "/mcp/")
-
-    print(f"Server URL: http://127.0.0.1:{server_port}{server_path}")
-    print(f"API Key: {api_key}")
-    print("\nPress Ctrl+C to stop the server\n")
+        try:
+            subprocess.run(
+                ["docker", "build", "-t", image_name, "."],
+                cwd=project_dir,
+                check=True,
+            )
+            print(f"✓ Docker image built successfully")
+            print()
+        except subprocess.CalledProcessError as e:
+            print(f"✗ Failed to build Docker image (exit code {e.returncode})")
+            sys.exit(1)
+
+    # Write container env vars to a temp file passed via --env-file, so the
+    # CLI ships one file instead of nine -e flags and the API key never
+    # shows up in /proc/*/cmdline
+    with tempfile.NamedTemporaryFile("w", delete=False, suffix=".env") as f:
+        f.write("\n".join(f"{k}={v}" for k, v in env_map.items()))
+        env_file = f.name
+    os.chmod(env_file, 0o600)
+    atexit.register(os.unlink, env_file)
 
     # Run Docker container
     docker_run_cmd = [
@@ -172,24 +260,8 @@ def start_server_docker(api_key: str) -> None:
         "--rm",
         "-p",
         f"{server_port}:{server_port}",  # Map port to host
-        "-e",
-        f"NEO4J_URI={neo4j_uri}",
-        "-e",
-        f"NEO4J_USERNAME={neo4j_username}",
-        "-e",
-        f"NEO4J_PASSWORD={neo4j_password}",
-        "-e",
-        f"NEO4J_DATABASE={neo4j_database}",
-        "-e",
-        "NEO4J_TRANSPORT=http",
-        "-e",
-        f"NEO4J_MCP_SERVER_HOST={server_host}",
-        "-e",
-        f"NEO4J_MCP_SERVER_PORT={server_port}",
-        "-e",
-        f"NEO4J_MCP_SERVER_PATH={server_path}",
-        "-e",
-        f"NEO4J_API_KEY={api_key}",
+        "--env-file",
+        env_file,
         image_name,
     ]
 
@@ -199,6 +271,118 @@ def start_server_docker(api_key: str) -> None:
         print("\n\n✓ Server stopped")
 
 
+def _run_docker_sdk(docker_sdk, image_name: str, project_dir: Path, env_map: dict, server_port: str) -> None:
+    """Build (if needed) and run the server image over one SDK connection."""
+    try:
+        cli = docker_sdk.from_env()
+    except docker_sdk.errors.DockerException as e:
+        print(f"✗ Could not connect to Docker: {e}")
+        print("Please install Docker and ensure the daemon is running:")
+        print("https://docs.docker.com/get-docker/")
+        sys.exit(1)
+
+    try:
+        cli.images.get(image_name)
+        print(f"✓ Reusing cached Docker image: {image_name}")
+        print()
+    except docker_sdk.errors.ImageNotFound:
+        print(f"Building Docker image: {image_name}")
+        print(f"Building from: {project_dir}")
+        print()
+        try:
+            cli.images.build(path=str(project_dir), tag=image_name)
+        except docker_sdk.errors.BuildError as e:
+            print(f"✗ Failed to build Docker image: {e}")
+            sys.exit(1)
+        print(f"✓ Docker image built successfully")
+        print()
+
+    # No auto-remove: a container that exits immediately (bad credentials,
+    # port conflict) would be deleted before its logs can be read
+    container = cli.containers.run(
+        image_name,
+        environment=env_map,
+        ports={f"{server_port}/tcp": server_port},
+        detach=True,
+    )
+    try:
+        for chunk in container.logs(stream=True, follow=True):
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+    except KeyboardInterrupt:
+        container.stop()
+        print("\n\n✓ Server stopped")
+    finally:
+        try:
+            container.remove(force=True)
+        except docker_sdk.errors.NotFound:
+            pass
+
+
+def start_server_docker(api_key: str, env_config: dict) -> None:
+    """Start the MCP server in a Docker container."""
+    print("Starting MCP Neo4j Cypher server in Docker...")
+    print()
+
+    # Get project directory (parent of test_api)
+    project_dir = Path(__file__).parent.parent
+    image_name = docker_image_tag(project_dir)
+
+    # Prepare environment variables for container
+    neo4j_uri = env_config.get("NEO4J_URI")
+    neo4j_username = env_config.get("NEO4J_USERNAME")
+    neo4j_password = env_config.get("NEO4J_PASSWORD")
+    neo4j_database = env_config.get("NEO4J_DATABASE") or "neo4j"
+
+    # For Docker on Mac/Windows, need to use special hostname to access host
+    # Rebuild the netloc around the new host so any userinfo and port are
+    # carried over untouched
+    if neo4j_uri:
+        parts = urlsplit(neo4j_uri)
+        if parts.hostname in ("localhost", "127.0.0.1"):
+            userinfo, _, _ = parts.netloc.rpartition("@")
+            new_netloc = "host.docker.internal"
+            if parts.port is not None:
+                new_netloc = f"{new_netloc}:{parts.port}"
+            if userinfo:
+                new_netloc = f"{userinfo}@{new_netloc}"
+            neo4j_uri = parts._replace(netloc=new_netloc).geturl()
+            print(f"⚠️  Modified Neo4j URI for Docker: {neo4j_uri}")
+            print()
+
+    server_host = "0.0.0.0"  # Bind to all interfaces in container
+    server_port = env_config.get("NEO4J_MCP_SERVER_PORT") or "8001"
+    server_path = env_config.get("NEO4J_MCP_SERVER_PATH") or "/mcp/"
+
+    print(f"Server URL: http://127.0.0.1:{server_port}{server_path}")
+    print(f"API Key: {api_key}")
+    print("\nPress Ctrl+C to stop the server\n")
+
+    env_map = {
+        "NEO4J_URI": neo4j_uri,
+        "NEO4J_USERNAME": neo4j_username,
+        "NEO4J_PASSWORD": neo4j_password,
+        "NEO4J_DATABASE": neo4j_database,
+        "NEO4J_TRANSPORT": "http",
+        "NEO4J_MCP_SERVER_HOST": server_host,
+        "NEO4J_MCP_SERVER_PORT": server_port,
+        "NEO4J_MCP_SERVER_PATH": server_path,
+        "NEO4J_API_KEY": api_key,
+    }
+
+    # Prefer the Docker SDK when it's installed: one daemon connection
+    # covers inspect, build, and run instead of a CLI handshake per command
+    try:
+        import docker as docker_sdk
+    except ImportError:
+        docker_sdk = None
+
+    if docker_sdk is not None:
+        _run_docker_sdk(docker_sdk, image_name, project_dir, env_map, server_port)
+    else:
+        _run_docker_cli(image_name, project_dir, env_map, server_port)
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -226,13 +410,13 @@ def main() -> None:
 
     # Generate and save API key
     api_key = generate_api_key()
-    update_env_with_api_key(api_key, env_path)
+    env_config = update_env_with_api_key(api_key, env_path)
 
     # Start server
     if args.docker:
-        start_server_docker(api_key)
+        start_server_docker(api_key, env_config)
     else:
-        start_server(api_key)
+        start_server(api_key, env_config)
 
 
 if __name__ == "__main__":
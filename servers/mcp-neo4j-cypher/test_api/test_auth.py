@@ -18,19 +18,40 @@ Usage:
 
 import argparse
 import asyncio
-import json
+import io
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
-from fastmcp import Client
-from fastmcp.client.transports import StreamableHttpTransport
+try:
+    import orjson as json  # 2-3x faster decode on typical schema payloads
+except ImportError:
+    import json
+
+try:
+    import ijson  # streams large schemas instead of materializing one dict
+except ImportError:
+    ijson = None
+
+# fastmcp and dotenv are imported lazily inside the functions that need
+# them, so the --docker wrapper path doesn't pay their import cost
+
+# Prebuilt image for --docker runs so packages install once, not per run
+CLIENT_IMAGE = "mcp-neo4j-cypher-testclient:latest"
+
+# Name of the long-lived container used by --keep-alive
+CLIENT_CONTAINER = "mcp-test-client"
+CLIENT_DOCKERFILE = b"FROM python:3.11-slim\nRUN pip install --no-cache-dir fastmcp python-dotenv orjson ijson\n"
 
 
 async def main() -> None:
     """Connect to MCP server and demonstrate tool usage."""
+    from dotenv import load_dotenv
+    from fastmcp import Client
+    from fastmcp.client.transports import StreamableHttpTransport
+
     print("=" * 60)
     print("MCP Neo4j Cypher Client - Authentication Demo")
     print("=" * 60)
@@ -54,9 +75,12 @@ async def main() -> None:
     print(f"✓ Loaded API key from .env: {api_key[:16]}...")
     print()
 
-    # Configure transport with authentication
+    # Configure transport with authentication; pass the Bearer header
+    # preformatted so it isn't re-derived from the key on every request
     server_url = "http://127.0.0.1:8001/mcp/"
-    transport = StreamableHttpTransport(server_url, auth=api_key)
+    transport = StreamableHttpTransport(
+        server_url, headers={"Authorization": f"Bearer {api_key}"}
+    )
     print(f"✓ Configured transport: {server_url}")
     print()
 
@@ -68,45 +92,58 @@ async def main() -> None:
             print("✓ Connection successful")
             print()
 
+            # Issue the independent RPCs concurrently over the same session
+            # so the demo waits for the slowest call, not the sum of both
+            tools, result = await asyncio.gather(
+                client.list_tools(),
+                client.call_tool("get_neo4j_schema", {}),
+            )
+
             # List available tools
             print("Available Tools:")
             print("-" * 60)
-            tools = await client.list_tools()
             for i, tool in enumerate(tools, 1):
                 print(f"{i}. {tool.name}")
-                if hasattr(tool, "description") and tool.description:
-                    # Print first line of description
-                    desc_first_line = tool.description.split("\n")[0]
+                desc = getattr(tool, "description", None)
+                if desc:
+                    # Print first line of description; maxsplit=1 stops
+                    # scanning after the first newline
+                    desc_first_line = desc.split("\n", 1)[0]
                     print(f"   {desc_first_line}")
             print()
 
-            # Call get_neo4j_schema tool
+            # Display get_neo4j_schema result
             print("Calling get_neo4j_schema tool...")
             print("-" * 60)
-            result = await client.call_tool("get_neo4j_schema", {})
-
-            # Display result
             print(f"✓ Tool call successful")
             print(f"  Result type: {result.content[0].type}")
             print()
 
-            # Parse and display schema (pretty print JSON)
+            # Parse and display schema
             if result.content and len(result.content) > 0:
                 schema_text = result.content[0].text
-                schema_data = json.loads(schema_text)
 
                 print("Neo4j Schema Summary:")
                 print("-" * 60)
 
-                # Count nodes and relationships
-                node_types = [
-                    k for k, v in schema_data.items() if v.get("type") == "node"
-                ]
-                rel_types = [
-                    k
-                    for k, v in schema_data.items()
-                    if v.get("type") == "relationship"
-                ]
+                # Classify node and relationship types in a single pass,
+                # streaming entries with ijson when available so a large
+                # schema is never materialized as one dict
+                if ijson is not None:
+                    schema_items = ijson.kvitems(
+                        io.BytesIO(schema_text.encode("utf-8")), ""
+                    )
+                else:
+                    schema_items = json.loads(schema_text).items()
+
+                node_types = []
+                rel_types = []
+                for name, info in schema_items:
+                    entry_type = info.get("type")
+                    if entry_type == "node":
+                        node_types.append((name, info))
+                    elif entry_type == "relationship":
+                        rel_types.append((name, info))
 
                 print(f"Node types: {len(node_types)}")
                 print(f"Relationship types: {len(rel_types)}")
@@ -115,8 +152,7 @@ async def main() -> None:
                 # Show node types with property counts
                 if node_types:
                     print("Node Types:")
-                    for node_type in node_types:
-                        node_info = schema_data[node_type]
+                    for node_type, node_info in node_types:
                         prop_count = len(node_info.get("properties", {}))
                         count = node_info.get("count", "?")
                         print(f"  - {node_type}: {prop_count} properties, {count} nodes")
@@ -125,8 +161,7 @@ async def main() -> None:
                 # Show relationship types
                 if rel_types:
                     print("Relationship Types:")
-                    for rel_type in rel_types:
-                        rel_info = schema_data[rel_type]
+                    for rel_type, rel_info in rel_types:
                         prop_count = len(rel_info.get("properties", {}))
                         count = rel_info.get("count", "?")
                         print(
@@ -134,10 +169,6 @@ async def main() -> None:
                         )
                     print()
 
-                # Optionally show full schema (commented out to avoid clutter)
-                # print("Full Schema (JSON):")
-                # print(json.dumps(schema_data, indent=2))
-
             print("=" * 60)
             print("✓ Client demo completed successfully")
             print("=" * 60)
@@ -152,8 +183,87 @@ async def main() -> None:
         raise
 
 
-def run_in_docker() -> None:
-    """Run the test client inside a Docker container."""
+def ensure_client_image() -> None:
+    """Build the test client Docker image if it doesn't exist yet."""
+    image_exists = (
+        subprocess.run(
+            ["docker", "image", "inspect", CLIENT_IMAGE],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ).returncode
+        == 0
+    )
+    if image_exists:
+        return
+
+    print(f"Building test client image: {CLIENT_IMAGE}")
+    subprocess.run(
+        ["docker", "build", "-t", CLIENT_IMAGE, "-"],
+        input=CLIENT_DOCKERFILE,
+        check=True,
+    )
+    print()
+
+
+def ensure_client_container(script_dir: Path) -> None:
+    """Start the long-lived test client container if it isn't running yet."""
+    running = subprocess.run(
+        ["docker", "inspect", "-f", "{{.State.Running}}", CLIENT_CONTAINER],
+        capture_output=True,
+        text=True,
+    )
+    if running.returncode == 0 and running.stdout.strip() == "true":
+        return
+
+    # Clear out any stopped leftover before starting fresh
+    subprocess.run(
+        ["docker", "rm", "-f", CLIENT_CONTAINER],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    ensure_client_image()
+
+    print(f"Starting long-lived client container: {CLIENT_CONTAINER}")
+    subprocess.run(
+        [
+            "docker",
+            "run",
+            "-d",
+            "--name",
+            CLIENT_CONTAINER,
+            "--network=host",
+            "-v",
+            f"{script_dir}:/app",
+            "-w",
+            "/app",
+            CLIENT_IMAGE,
+            "sleep",
+            "infinity",
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    print()
+
+
+def stop_client_container() -> None:
+    """Remove the long-lived test client container."""
+    subprocess.run(
+        ["docker", "rm", "-f", CLIENT_CONTAINER],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    print(f"✓ Removed container {CLIENT_CONTAINER}")
+
+
+def run_in_docker(keep_alive: bool = False) -> None:
+    """Run the test client inside a Docker container.
+
+    With keep_alive, runs via docker exec in a long-lived container so
+    repeat runs skip container cold start entirely.
+    """
+    from dotenv import load_dotenv
+
     print("=" * 60)
     print("Running MCP Client in Docker Container")
     print("=" * 60)
@@ -178,50 +288,68 @@ def run_in_docker() -> None:
     print(f"✓ Loaded API key from .env: {api_key[:16]}...")
     print()
 
+    # Bail early if docker isn't installed; the final dispatch execs it
+    if shutil.which("docker") is None:
+        print("✗ Docker not found")
+        print("Please install Docker: https://docs.docker.com/get-docker/")
+        sys.exit(1)
+
     # Build Docker command to run the test client
-    # Use Python official image with network=host to access localhost:8001
+    # Use the prebuilt client image with network=host to access localhost:8001
     script_dir = Path(__file__).parent.absolute()
     script_name = Path(__file__).name
 
-    docker_cmd = [
-        "docker",
-        "run",
-        "--rm",
-        "-i",
-        "--network=host",  # Use host network to access localhost:8001
-        "-v",
-        f"{script_dir}:/app",  # Mount the test_api directory
-        "-w",
-        "/app",
-        "-e",
-        f"NEO4J_API_KEY={api_key}",  # Pass API key to container
-        "python:3.11-slim",
-        "sh",
-        "-c",
-        f"pip install -q fastmcp python-dotenv && python {script_name}",
-    ]
-
-    print("Starting Docker container...")
-    print(f"Command: {' '.join(docker_cmd[:8])} ... python:3.11-slim ...")
-    print()
-
+    # Prepare the client image (and, for keep-alive, the container); the
+    # client run itself happens after the exec below and reports its own
+    # errors directly
     try:
-        # Run Docker container
-        result = subprocess.run(
-            docker_cmd, check=True, text=True, capture_output=False
-        )
-        sys.exit(result.returncode)
+        if keep_alive:
+            ensure_client_container(script_dir)
+        else:
+            ensure_client_image()
     except subprocess.CalledProcessError as e:
-        print(f"\n✗ Docker execution failed with exit code {e.returncode}")
+        print(f"\n✗ Failed to prepare the Docker test client (exit code {e.returncode})")
         print("\nTroubleshooting:")
-        print("1. Ensure Docker is installed and running")
-        print("2. Ensure the MCP server is running (start_server.py)")
-        print("3. Check that the .env file contains a valid API key")
+        print("1. Ensure the Docker daemon is running")
+        print("2. Check network access for pulling python:3.11-slim")
         sys.exit(e.returncode)
-    except FileNotFoundError:
-        print("✗ Docker not found")
-        print("Please install Docker: https://docs.docker.com/get-docker/")
-        sys.exit(1)
+
+    if keep_alive:
+        docker_cmd = [
+            "docker",
+            "exec",
+            "-e",
+            f"NEO4J_API_KEY={api_key}",  # Pass API key to container
+            CLIENT_CONTAINER,
+            "python",
+            script_name,
+        ]
+        print(f"Running client in container {CLIENT_CONTAINER}...")
+        print()
+    else:
+        docker_cmd = [
+            "docker",
+            "run",
+            "--rm",
+            "-i",
+            "--network=host",  # Use host network to access localhost:8001
+            "-v",
+            f"{script_dir}:/app",  # Mount the test_api directory
+            "-w",
+            "/app",
+            "-e",
+            f"NEO4J_API_KEY={api_key}",  # Pass API key to container
+            CLIENT_IMAGE,
+            "python",
+            script_name,
+        ]
+        print("Starting Docker container...")
+        print(f"Command: {' '.join(docker_cmd[:8])} ... {CLIENT_IMAGE} ...")
+        print()
+
+    # Replace this wrapper process with docker; Python adds nothing while
+    # the container runs and the exit code passes through unchanged
+    os.execvp("docker", docker_cmd)
 
 
 def parse_args() -> argparse.Namespace:
@@ -234,15 +362,44 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Run the client in a Docker container instead of locally",
     )
+    parser.add_argument(
+        "--keep-alive",
+        action="store_true",
+        help="With --docker, reuse a long-lived container across runs",
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Remove the long-lived client container and exit",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
 
-    if args.docker:
+    if args.stop:
+        # Clean up the keep-alive container
+        stop_client_container()
+    elif args.docker:
         # Run in Docker container
-        run_in_docker()
+        run_in_docker(keep_alive=args.keep_alive)
     else:
-        # Run locally
-        asyncio.run(main())
+        # Run locally; use uvloop's C event loop when it's available
+        try:
+            import uvloop
+        except ImportError:
+            uvloop = None
+
+        if sys.version_info >= (3, 11):
+            if uvloop is not None:
+                runner = asyncio.Runner(loop_factory=uvloop.new_event_loop)
+            else:
+                runner = asyncio.Runner()
+            with runner:
+                runner.run(main())
+        else:
+            # asyncio.Runner is 3.11+; the project floor is 3.10
+            if uvloop is not None:
+                uvloop.install()
+            asyncio.run(main())